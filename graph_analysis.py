@@ -1,123 +1,347 @@
-from typing import Set, List, Tuple, Optional
+from typing import Set, List, Tuple, Optional, Dict, Iterator
+from array import array
 from collections import deque
+from contextlib import contextmanager
 from graph import Graph
 
-def find_connected_components(graph: Graph) -> List[Set[str]]:
-    """Find all connected components in the graph using BFS"""
-    components = []
-    unvisited = set(graph.vertices.keys())
-    
-    while unvisited:
-        # Start a new component
-        start = next(iter(unvisited))
-        component = set()
-        queue = deque([start])
-        
-        # BFS
-        while queue:
-            vertex = queue.popleft()
-            if vertex in unvisited:
-                component.add(vertex)
-                unvisited.remove(vertex)
-                queue.extend(n for n in graph.vertices[vertex].neighbors if n in unvisited)
-        
-        components.append(component)
-    
-    return components
-
-def is_bipartite(graph: Graph) -> Tuple[bool, Optional[Tuple[Set[str], Set[str]]]]:
+class SetBackend:
+    """Analysis backend working directly on the dict-of-sets adjacency"""
+    name = "sets"
+
+    def find_connected_components(self, graph: Graph) -> List[Set[str]]:
+        """Find all connected components in the graph using BFS"""
+        components = []
+        unvisited = set(graph.vertices.keys())
+
+        for start in graph.vertices:
+            if start not in unvisited:
+                continue
+            # Start a new component
+            component = set()
+            queue = deque([start])
+
+            # BFS
+            while queue:
+                vertex = queue.popleft()
+                if vertex in unvisited:
+                    component.add(vertex)
+                    unvisited.remove(vertex)
+                    queue.extend(n for n in graph.vertices[vertex].neighbors if n in unvisited)
+
+            components.append(component)
+
+        return components
+
+    def two_color(self, graph: Graph) -> Optional[Dict[str, int]]:
+        """Color vertices with 0/1 so that every edge joins different colors,
+        or return None if that is impossible"""
+        colors = {}  # vertex -> color (0 or 1)
+
+        def try_color_component(start: str) -> bool:
+            queue = deque([(start, 0)])
+
+            while queue:
+                vertex, color = queue.popleft()
+
+                if vertex in colors:
+                    if colors[vertex] != color:
+                        return False
+                    continue
+
+                colors[vertex] = color
+                next_color = 1 - color
+
+                for neighbor in graph.vertices[vertex].neighbors:
+                    if neighbor in graph.vertices:  # ignore neighbors outside the vertex table
+                        queue.append((neighbor, next_color))
+
+            return True
+
+        # Try to color each component
+        for vertex in graph.vertices:
+            if vertex not in colors:
+                if not try_color_component(vertex):
+                    return None
+
+        return colors
+
+@contextmanager
+def cached_views(graph: Graph) -> Iterator[Graph]:
+    """Reuse the views backends build from graph (CSR arrays, bitsets) for
+    every analysis inside the block. The graph must not change inside it"""
+    previous = graph._analysis_cache
+    graph._analysis_cache = {}
+    try:
+        yield graph
+    finally:
+        graph._analysis_cache = previous
+
+def _view(graph: Graph, name: str, build):
+    """Build the view of graph for a backend, or reuse it inside cached_views"""
+    cache = graph._analysis_cache
+    if cache is None:
+        return build(graph)
+    if name not in cache:
+        cache[name] = build(graph)
+    return cache[name]
+
+class CSRAdjacency:
+    """Compressed sparse row view of a graph: vertex i has neighbors
+    targets[offsets[i]:offsets[i + 1]]"""
+
+    def __init__(self, graph: Graph):
+        self.labels = list(graph.vertices.keys())
+        index = {v: i for i, v in enumerate(self.labels)}
+        self.offsets = array('l', [0])
+        self.targets = array('l')
+        for v in self.labels:
+            # Neighbors outside the vertex table are ignored, as in the sets backend
+            self.targets.extend(index[n] for n in graph.vertices[v].neighbors if n in index)
+            self.offsets.append(len(self.targets))
+
+class CSRBackend:
+    """Analysis backend using integer vertex ids over CSR arrays.
+    Building the CSR view costs more than one BFS over the neighbor sets, so
+    it pays off when several analyses share one view inside cached_views"""
+    name = "csr"
+
+    def find_connected_components(self, graph: Graph) -> List[Set[str]]:
+        csr = _view(graph, self.name, CSRAdjacency)
+        offsets, targets = csr.offsets, csr.targets
+        visited = bytearray(len(csr.labels))
+        components = []
+
+        for start in range(len(csr.labels)):
+            if visited[start]:
+                continue
+            visited[start] = 1
+            queue = deque([start])
+            members = [start]
+            while queue:
+                u = queue.popleft()
+                for w in targets[offsets[u]:offsets[u + 1]]:
+                    if not visited[w]:
+                        visited[w] = 1
+                        queue.append(w)
+                        members.append(w)
+            components.append({csr.labels[i] for i in members})
+
+        return components
+
+    def two_color(self, graph: Graph) -> Optional[Dict[str, int]]:
+        csr = _view(graph, self.name, CSRAdjacency)
+        offsets, targets = csr.offsets, csr.targets
+        colors = bytearray([2]) * len(csr.labels)  # 2 means uncolored
+
+        for start in range(len(csr.labels)):
+            if colors[start] != 2:
+                continue
+            colors[start] = 0
+            queue = deque([start])
+            while queue:
+                u = queue.popleft()
+                next_color = 1 - colors[u]
+                for w in targets[offsets[u]:offsets[u + 1]]:
+                    if colors[w] == 2:
+                        colors[w] = next_color
+                        queue.append(w)
+                    elif colors[w] != next_color:
+                        return None
+
+        return dict(zip(csr.labels, colors))
+
+def _iter_bits(mask: int):
+    """Yield the indices of the set bits of mask"""
+    bits = bin(mask)[:1:-1]  # least significant bit first
+    i = bits.find('1')
+    while i >= 0:
+        yield i
+        i = bits.find('1', i + 1)
+
+class BitsetBackend:
+    """Analysis backend storing each neighborhood as an integer bitmask;
+    whole BFS frontiers are expanded with a few big-integer operations.
+    Every mask is as wide as the graph, so time and memory grow with the
+    square of the vertex count: use it for small or dense graphs only"""
+    name = "bitset"
+
+    @staticmethod
+    def _masks(graph: Graph) -> Tuple[List[str], List[int]]:
+        labels = list(graph.vertices.keys())
+        index = {v: i for i, v in enumerate(labels)}
+        masks = []
+        for v in labels:
+            row = bytearray((len(labels) + 7) // 8)
+            for n in graph.vertices[v].neighbors:
+                i = index.get(n)
+                if i is not None:  # ignore neighbors outside the vertex table
+                    row[i >> 3] |= 1 << (i & 7)
+            masks.append(int.from_bytes(row, 'little'))
+        return labels, masks
+
+    def find_connected_components(self, graph: Graph) -> List[Set[str]]:
+        labels, masks = _view(graph, self.name, self._masks)
+        unvisited = (1 << len(labels)) - 1
+        components = []
+
+        while unvisited:
+            start = unvisited & -unvisited
+            component = frontier = start
+            unvisited ^= start
+            while frontier:
+                reached = 0
+                for i in _iter_bits(frontier):
+                    reached |= masks[i]
+                frontier = reached & unvisited
+                unvisited ^= frontier
+                component |= frontier
+            components.append({labels[i] for i in _iter_bits(component)})
+
+        return components
+
+    def two_color(self, graph: Graph) -> Optional[Dict[str, int]]:
+        labels, masks = _view(graph, self.name, self._masks)
+        uncolored = (1 << len(labels)) - 1
+        sides = [0, 0]  # bitmask of vertices per color
+
+        while uncolored:
+            frontier = uncolored & -uncolored
+            color = 0
+            while frontier:
+                uncolored ^= frontier
+                sides[color] |= frontier
+                reached = 0
+                for i in _iter_bits(frontier):
+                    reached |= masks[i]
+                frontier = reached & uncolored
+                color = 1 - color
+
+        # Every edge must join the two sides
+        for color in (0, 1):
+            for i in _iter_bits(sides[color]):
+                if masks[i] & sides[color]:
+                    return None
+
+        colors = {}
+        for color in (0, 1):
+            for i in _iter_bits(sides[color]):
+                colors[labels[i]] = color
+        return colors
+
+_BACKENDS = {
+    SetBackend.name: SetBackend(),
+    CSRBackend.name: CSRBackend(),
+    BitsetBackend.name: BitsetBackend(),
+}
+_default_backend = SetBackend.name
+
+def register_backend(backend) -> None:
+    """Make a backend available by its name. A backend provides
+    find_connected_components(graph) and two_color(graph)"""
+    _BACKENDS[backend.name] = backend
+
+def available_backends() -> List[str]:
+    """Return the names of all registered backends"""
+    return sorted(_BACKENDS)
+
+def set_default_backend(name: str) -> None:
+    """Select the backend used when a call does not specify one"""
+    global _default_backend
+    get_backend(name)
+    _default_backend = name
+
+def get_default_backend() -> str:
+    """Return the name of the backend used by default"""
+    return _default_backend
+
+def get_backend(name: Optional[str] = None):
+    """Return the backend registered under name, or the default one"""
+    if name is None:
+        name = _default_backend
+    try:
+        return _BACKENDS[name]
+    except KeyError:
+        raise ValueError(f"Unknown analysis backend '{name}'. "
+                         f"Available backends: {', '.join(available_backends())}")
+
+def find_connected_components(graph: Graph, backend: Optional[str] = None) -> List[Set[str]]:
+    """Find all connected components in the graph"""
+    return get_backend(backend).find_connected_components(graph)
+
+def is_connected(graph: Graph, backend: Optional[str] = None) -> Tuple[bool, Optional[List[Set[str]]]]:
+    """Check if graph is connected and return connected components if not"""
+    components = find_connected_components(graph, backend)
+    return len(components) == 1, components if len(components) > 1 else None
+
+def is_bipartite(graph: Graph, backend: Optional[str] = None) -> Tuple[bool, Optional[Tuple[Set[str], Set[str]]]]:
     """Check if graph is bipartite and return the two vertex sets if true"""
     if not graph.vertices:
         return True, (set(), set())
-    
-    colors = {}  # vertex -> color (0 or 1)
-    
-    def try_color_component(start: str) -> bool:
-        queue = deque([(start, 0)])
-        
-        while queue:
-            vertex, color = queue.popleft()
-            
-            if vertex in colors:
-                if colors[vertex] != color:
-                    return False
-                continue
-                
-            colors[vertex] = color
-            next_color = 1 - color
-            
-            for neighbor in graph.vertices[vertex].neighbors:
-                queue.append((neighbor, next_color))
-        
-        return True
-    
-    # Try to color each component
-    for vertex in graph.vertices:
-        if vertex not in colors:
-            if not try_color_component(vertex):
-                return False, None
-    
-    # If we get here, the graph is bipartite
+
+    colors = get_backend(backend).two_color(graph)
+    if colors is None:
+        return False, None
+
     set0 = {v for v, c in colors.items() if c == 0}
     set1 = {v for v, c in colors.items() if c == 1}
     return True, (set0, set1)
 
-def is_complete_bipartite(graph: Graph) -> Tuple[bool, Optional[Tuple[Set[str], Set[str]]]]:
+def is_complete_bipartite(graph: Graph, backend: Optional[str] = None) -> Tuple[bool, Optional[Tuple[Set[str], Set[str]]]]:
     """Check if graph is complete bipartite and return the two vertex sets if true"""
     # First check if it's bipartite
-    is_bip, sets = is_bipartite(graph)
+    is_bip, sets = is_bipartite(graph, backend)
     if not is_bip or not sets:
         return False, None
-    
+
     set1, set2 = sets
-    
+
     # Check if every vertex in set1 is connected to all vertices in set2
     for v1 in set1:
         if len(graph.vertices[v1].neighbors) != len(set2):
             return False, None
         if not set2.issubset(graph.vertices[v1].neighbors):
             return False, None
-    
+
     # Check if every vertex in set2 is connected to all vertices in set1
     for v2 in set2:
         if len(graph.vertices[v2].neighbors) != len(set1):
             return False, None
         if not set1.issubset(graph.vertices[v2].neighbors):
             return False, None
-    
+
     return True, (set1, set2)
 
-def determine_graph_type(graph: Graph) -> Tuple[bool, bool, bool, bool]:
+def determine_graph_type(graph: Graph, backend: Optional[str] = None) -> Tuple[bool, bool, bool, bool]:
     """Determine if graph is complete, cycle, wheel, or n-cube
     Returns tuple of (is_complete, is_cycle, is_wheel, is_hypercube)"""
     n = len(graph.vertices)
     if n == 0:
         return False, False, False, False
-    
+
     # Check if complete
     is_complete = all(len(v.neighbors) == n-1 for v in graph.vertices.values())
-    
+
     # Check if cycle
-    is_cycle = (n >= 3 and 
+    is_cycle = (n >= 3 and
                 all(len(v.neighbors) == 2 for v in graph.vertices.values()) and
-                len(find_connected_components(graph)) == 1)
-    
+                len(find_connected_components(graph, backend)) == 1)
+
     # Check if wheel
     if n >= 4:
         # Find potential center (vertex with degree n-1)
-        center_candidates = [v for v, data in graph.vertices.items() 
+        center_candidates = [v for v, data in graph.vertices.items()
                            if len(data.neighbors) == n-1]
         if len(center_candidates) == 1:
             center = center_candidates[0]
             # Remove center and check if remaining graph is a cycle
             remaining_vertices = set(graph.vertices.keys()) - {center}
-            is_wheel = all(len(graph.vertices[v].neighbors - {center}) == 2 
+            is_wheel = all(len(graph.vertices[v].neighbors - {center}) == 2
                           for v in remaining_vertices)
         else:
             is_wheel = False
     else:
         is_wheel = False
-    
+
     # Check if hypercube
     # All vertices must have same degree, which must be log2(n)
     from math import log2
@@ -126,5 +350,5 @@ def determine_graph_type(graph: Graph) -> Tuple[bool, bool, bool, bool]:
         is_hypercube = all(len(v.neighbors) == degree for v in graph.vertices.values())
     else:
         is_hypercube = False
-    
-    return is_complete, is_cycle, is_wheel, is_hypercube 
\ No newline at end of file
+
+    return is_complete, is_cycle, is_wheel, is_hypercube
@@ -1,25 +1,185 @@
-from typing import List, Dict, Set, Tuple
+from typing import List, Dict, Set, Tuple, Optional, BinaryIO, Iterator, Iterable
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+import gzip
+import io
 from graph import Graph, GraphInputType, Vertex
 
+GZIP_MAGIC = b'\x1f\x8b'
+# Level 6 compresses almost as well as gzip's default 9 at a fraction of the cost
+DEFAULT_GZIP_LEVEL = 6
+ZSTD_MAGIC = b'\x28\xb5\x2f\xfd'
+
+def _compression_from_extension(filename: str) -> Optional[str]:
+    """Guess the compression of a file from its extension"""
+    lower = str(filename).lower()
+    if lower.endswith('.gz'):
+        return 'gzip'
+    if lower.endswith(('.zst', '.zstd')):
+        return 'zstd'
+    return None
+
+def _compression_from_magic(filename: str) -> Optional[str]:
+    """Detect the compression of a file from its first bytes"""
+    with open(filename, 'rb') as f:
+        head = f.read(4)
+    if head.startswith(GZIP_MAGIC):
+        return 'gzip'
+    if head.startswith(ZSTD_MAGIC):
+        return 'zstd'
+    return None
+
+@contextmanager
+def _open_zstd(filename: str, mode: str, level: Optional[int] = None) -> Iterator[BinaryIO]:
+    """Open a zstd stream using whichever zstd module is installed.
+    level only applies when writing; None keeps the library default"""
+    try:
+        from compression import zstd  # Python 3.14+
+    except ImportError:
+        zstd = None
+    if zstd is not None:
+        with zstd.open(filename, mode, level=level if mode == 'wb' else None) as f:
+            yield f
+        return
+
+    try:
+        import zstandard
+    except ImportError:
+        raise ImportError("zstd compressed graph files need the 'zstandard' package "
+                          "(pip install zstandard) or Python 3.14+")
+    with open(filename, mode) as raw:
+        if mode == 'rb':
+            with io.BufferedReader(zstandard.ZstdDecompressor().stream_reader(raw)) as f:
+                yield f
+        else:
+            compressor = zstandard.ZstdCompressor() if level is None else zstandard.ZstdCompressor(level=level)
+            with compressor.stream_writer(raw) as f:
+                yield f
+
+@contextmanager
+def _open_binary(filename: str, mode: str, compression: Optional[str],
+                 level: Optional[int] = None) -> Iterator[BinaryIO]:
+    """Open filename as a binary stream, (de)compressing transparently"""
+    if compression == 'gzip':
+        with gzip.open(filename, mode, compresslevel=DEFAULT_GZIP_LEVEL if level is None else level) as f:
+            yield f
+    elif compression == 'zstd':
+        with _open_zstd(filename, mode, level) as f:
+            yield f
+    elif compression is None:
+        with open(filename, mode) as f:
+            yield f
+    else:
+        raise ValueError(f"Unsupported compression '{compression}'. Use 'gzip', 'zstd' or None")
+
+def _encode_varint(value: int, out: bytearray) -> None:
+    """Append value to out as an unsigned LEB128 varint"""
+    while value >= 0x80:
+        out.append((value & 0x7f) | 0x80)
+        value >>= 7
+    out.append(value)
+
+def _decode_varint(data: bytes, pos: int) -> Tuple[int, int]:
+    """Decode the varint starting at pos, returning (value, next position)"""
+    value = 0
+    shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7f) << shift
+        if byte < 0x80:
+            return value, pos
+        shift += 7
+
+def _read_compact(graph: Graph, data: bytes) -> None:
+    """Fill graph from the body of a Compact file"""
+    try:
+        count, pos = _decode_varint(data, 0)
+        labels = []
+        for _ in range(count):
+            length, pos = _decode_varint(data, pos)
+            if pos + length > len(data):
+                raise IndexError("label runs past the end of the data")
+            labels.append(data[pos:pos + length].decode('utf-8'))
+            pos += length
+
+        for label in labels:
+            graph.vertices[label] = Vertex(label)
+
+        # Neighbor ids are sorted, each stored as the gap from the previous one
+        for label in labels:
+            degree, pos = _decode_varint(data, pos)
+            neighbors = graph.vertices[label].neighbors
+            index = 0
+            for _ in range(degree):
+                delta = data[pos]
+                if delta < 0x80:  # most gaps fit in a single byte
+                    pos += 1
+                else:
+                    delta, pos = _decode_varint(data, pos)
+                index += delta
+                neighbors.add(labels[index])
+    except (IndexError, UnicodeDecodeError) as e:
+        raise ValueError(f"Truncated or corrupt Compact graph data: {e}") from e
+
+def _write_compact(graph: Graph) -> bytes:
+    """Encode the body of a Compact file"""
+    # Like the List format, neighbors missing from the vertex table become vertices
+    labels = set(graph.vertices)
+    for vertex in graph.vertices.values():
+        labels.update(vertex.neighbors)
+    labels = sorted(labels)
+    index = {v: i for i, v in enumerate(labels)}
+
+    out = bytearray()
+    _encode_varint(len(labels), out)
+    for label in labels:
+        encoded = label.encode('utf-8')
+        _encode_varint(len(encoded), out)
+        out += encoded
+
+    for label in labels:
+        vertex = graph.vertices.get(label)
+        ids = sorted(index[n] for n in vertex.neighbors) if vertex else []
+        _encode_varint(len(ids), out)
+        previous = 0
+        for i in ids:
+            delta = i - previous
+            if delta < 0x80:  # most gaps fit in a single byte
+                out.append(delta)
+            else:
+                _encode_varint(delta, out)
+            previous = i
+
+    return bytes(out)
+
 def read_graph_from_file(filename: str) -> Graph:
-    """Read graph from a file in either Matrix or List format"""
+    """Read graph from a file in Matrix, List or Compact format.
+    gzip and zstd compressed files are detected from their magic bytes"""
     graph = Graph()
-    
-    with open(filename, 'r') as f:
+
+    with _open_binary(filename, 'rb', _compression_from_magic(filename)) as raw:
         # Read input type
-        input_type = f.readline().strip()
+        input_type = raw.readline().decode('utf-8').strip()
         graph.input_type = GraphInputType(input_type)
-        
+
+        if graph.input_type == GraphInputType.COMPACT:
+            _read_compact(graph, raw.read())
+            return graph
+
+        f = io.TextIOWrapper(raw, encoding='utf-8')
+
         if graph.input_type == GraphInputType.MATRIX:
             # Read vertex labels
             labels = f.readline().strip().split()
             if labels[0] == 'M':  # Skip the M character
                 labels = labels[1:]
-            
+
             # Create vertices
             for label in labels:
                 graph.vertices[label] = Vertex(label)
-            
+
             # Read adjacency matrix
             for i, line in enumerate(f):
                 row = line.strip().split()
@@ -27,42 +187,59 @@ def read_graph_from_file(filename: str) -> Graph:
                 for j, value in enumerate(row[1:]):  # Skip the vertex label
                     if value == '1':
                         graph.vertices[current_vertex].neighbors.add(labels[j])
-                        
+
         else:  # List format
             for line in f:
                 vertices = line.strip().split()
                 if not vertices:
                     continue
-                    
+
                 current_vertex = vertices[0]
                 if current_vertex not in graph.vertices:
                     graph.vertices[current_vertex] = Vertex(current_vertex)
-                
+
                 # Add neighbors
                 for neighbor in vertices[1:]:
                     if neighbor not in graph.vertices:
                         graph.vertices[neighbor] = Vertex(neighbor)
                     graph.vertices[current_vertex].neighbors.add(neighbor)
-    
+
+        f.detach()
+
     return graph
 
-def write_graph_to_file(graph: Graph, filename: str, output_type: GraphInputType) -> None:
-    """Write graph to a file in either Matrix or List format"""
-    with open(filename, 'w') as f:
-        f.write(output_type.value + '\n')
-        
+def write_graph_to_file(graph: Graph, filename: str, output_type: GraphInputType,
+                        compression: Optional[str] = None,
+                        compresslevel: Optional[int] = None) -> None:
+    """Write graph to a file in Matrix, List or Compact format.
+    compression is 'gzip', 'zstd' or None; when None it is taken from the
+    file extension (.gz, .zst/.zstd), otherwise the file is left uncompressed.
+    compresslevel defaults to DEFAULT_GZIP_LEVEL for gzip and the library
+    default for zstd"""
+    if compression is None:
+        compression = _compression_from_extension(filename)
+
+    with _open_binary(filename, 'wb', compression, compresslevel) as raw:
+        raw.write((output_type.value + '\n').encode('utf-8'))
+
+        if output_type == GraphInputType.COMPACT:
+            raw.write(_write_compact(graph))
+            return
+
+        f = io.TextIOWrapper(raw, encoding='utf-8')
+
         if output_type == GraphInputType.MATRIX:
             # Write vertex labels
             vertices = sorted(graph.vertices.keys())
             f.write('M ' + ' '.join(vertices) + '\n')
-            
+
             # Write matrix
             for v1 in vertices:
                 row = [v1]  # Start with vertex label
                 for v2 in vertices:
                     row.append('1' if v2 in graph.vertices[v1].neighbors else '0')
                 f.write('\t'.join(row) + '\n')
-                
+
         else:  # List format
             # Write adjacency list
             for vertex in sorted(graph.vertices.keys()):
@@ -70,4 +247,36 @@ def write_graph_to_file(graph: Graph, filename: str, output_type: GraphInputType
                 if neighbors:
                     f.write(f"{vertex}\t{' '.join(neighbors)}\n")
                 else:
-                    f.write(f"{vertex}\n") 
\ No newline at end of file
+                    f.write(f"{vertex}\n")
+
+        f.detach()
+
+def iter_graphs_from_files(filenames: Iterable[str], prefetch: int = 4,
+                           max_workers: Optional[int] = None) -> Iterator[Tuple[str, Graph]]:
+    """Yield (filename, graph) pairs in input order while the next files are
+    read in background threads. At most prefetch files are loaded ahead of
+    the consumer, which bounds how many graphs are held in memory"""
+    if prefetch < 1:
+        raise ValueError("prefetch must be at least 1")
+
+    filenames = iter(filenames)
+    pending = deque()  # (filename, future) in input order
+    executor = ThreadPoolExecutor(max_workers=max_workers or prefetch)
+    try:
+        for filename in filenames:
+            pending.append((filename, executor.submit(read_graph_from_file, filename)))
+            if len(pending) >= prefetch:
+                break
+
+        while pending:
+            filename, future = pending.popleft()
+            graph = future.result()
+            # Refill the window before handing the graph to the consumer
+            for next_filename in filenames:
+                pending.append((next_filename, executor.submit(read_graph_from_file, next_filename)))
+                break
+            yield filename, graph
+    finally:
+        for _, future in pending:
+            future.cancel()
+        executor.shutdown(wait=True)
@@ -0,0 +1,202 @@
+from dataclasses import dataclass, field
+from typing import Dict, Hashable, Iterator, Optional
+from collections import OrderedDict
+import os
+import shutil
+import sys
+import tempfile
+from graph import Graph, GraphInputType
+from graph_io import read_graph_from_file, write_graph_to_file
+
+def estimate_graph_size(graph: Graph) -> int:
+    """Approximate number of bytes used by a graph's vertices, edges and
+    the analysis views cached on it"""
+    # Neighbor labels are often separate string objects (e.g. when read from
+    # a file), so only those that are the vertex table keys themselves are free
+    keys = {label: label for label in graph.vertices}
+    size = sys.getsizeof(graph) + sys.getsizeof(graph.vertices)
+    # Vertices share one attribute layout. Sample a single instance dict,
+    # since reading __dict__ creates it on Pythons that store attributes inline
+    vertex_dict_size = sys.getsizeof(next(iter(graph.vertices.values())).__dict__) if graph.vertices else 0
+    for label, vertex in graph.vertices.items():
+        size += (sys.getsizeof(label) + sys.getsizeof(vertex) + vertex_dict_size
+                 + sys.getsizeof(vertex.neighbors))
+        if vertex.label is not label:
+            size += sys.getsizeof(vertex.label)
+        for neighbor in vertex.neighbors:
+            if keys.get(neighbor) is not neighbor:
+                size += sys.getsizeof(neighbor)
+
+    for view in (getattr(graph, '_analysis_cache', None) or {}).values():
+        parts = view if isinstance(view, tuple) else vars(view).values()
+        size += sys.getsizeof(view)
+        for part in parts:
+            size += sys.getsizeof(part)
+            # Bitset masks are big integers; labels are already counted
+            if isinstance(part, list):
+                size += sum(sys.getsizeof(item) for item in part if isinstance(item, int))
+    return size
+
+def _estimate_value_size(value) -> int:
+    """Approximate number of bytes used by an analysis result"""
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(_estimate_value_size(k) + _estimate_value_size(v) for k, v in value.items())
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        size += sum(_estimate_value_size(v) for v in value)
+    return size
+
+@dataclass
+class _StoreEntry:
+    """A graph tracked by the store, either in memory or spilled to disk"""
+    graph: Optional[Graph]
+    input_type: Optional[GraphInputType]
+    size: int = 0  # graph plus cached analyses
+    analyses: Dict[str, object] = field(default_factory=dict)
+    analyses_size: int = 0
+    spill_path: Optional[str] = None
+    spill_current: bool = False  # spill file matches the graph
+
+class GraphStore:
+    """Keeps graphs by key within a memory budget (in bytes).
+    When the budget is exceeded the least recently used graphs are written
+    to spill files and dropped from memory; they are read back on next access"""
+
+    def __init__(self, memory_budget: int, spill_dir: Optional[str] = None,
+                 spill_format: GraphInputType = GraphInputType.COMPACT):
+        if memory_budget <= 0:
+            raise ValueError("Memory budget must be positive")
+        self.memory_budget = memory_budget
+        self.spill_format = spill_format
+        self._owns_spill_dir = spill_dir is None
+        self.spill_dir = tempfile.mkdtemp(prefix="graph_store_") if spill_dir is None else spill_dir
+        self._entries: Dict[Hashable, _StoreEntry] = {}
+        self._resident: 'OrderedDict[Hashable, None]' = OrderedDict()  # in memory, LRU order, oldest first
+        self.memory_usage = 0
+        self.evictions = 0
+        self.reloads = 0
+
+    def put(self, key: Hashable, graph: Graph) -> None:
+        """Add or replace a graph. Call again after modifying a stored graph
+        so its size and cached analyses are brought up to date"""
+        self.remove(key)
+        entry = _StoreEntry(graph, graph.input_type, estimate_graph_size(graph))
+        self._entries[key] = entry
+        self._resident[key] = None
+        self.memory_usage += entry.size
+        self._enforce_budget()
+
+    def get(self, key: Hashable) -> Graph:
+        """Return the graph stored under key, reloading it if it was spilled.
+        The caller may modify the returned graph: it is written out again on
+        its next eviction and cached analyses are recomputed"""
+        entry = self._touch(key)
+        entry.spill_current = False
+        if entry.analyses:
+            entry.analyses.clear()
+            entry.size -= entry.analyses_size
+            self.memory_usage -= entry.analyses_size
+            entry.analyses_size = 0
+        return entry.graph
+
+    def analyze(self, key: Hashable, analysis: str):
+        """Run a Graph analysis method (e.g. 'is_bipartite') on the stored
+        graph, caching the result until the graph is replaced or evicted"""
+        entry = self._touch(key)
+        if analysis not in entry.analyses:
+            result = getattr(entry.graph, analysis)()
+            entry.analyses[analysis] = result
+            entry.analyses_size += _estimate_value_size(result)
+            # The graph may have changed since get handed it out
+            size = estimate_graph_size(entry.graph) + entry.analyses_size
+            self.memory_usage += size - entry.size
+            entry.size = size
+            self._enforce_budget()
+        return entry.analyses[analysis]
+
+    def remove(self, key: Hashable) -> None:
+        """Forget the graph stored under key, if any"""
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        self._resident.pop(key, None)
+        self.memory_usage -= entry.size
+        if entry.spill_path is not None and os.path.exists(entry.spill_path):
+            os.remove(entry.spill_path)
+
+    def is_resident(self, key: Hashable) -> bool:
+        """Check if the graph stored under key is currently in memory"""
+        return self._entries[key].graph is not None
+
+    def close(self) -> None:
+        """Drop all graphs and delete the spill files"""
+        for key in list(self._entries):
+            self.remove(key)
+        if self._owns_spill_dir:
+            shutil.rmtree(self.spill_dir, ignore_errors=True)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __iter__(self) -> Iterator[Hashable]:
+        return iter(self._entries)
+
+    def __getitem__(self, key: Hashable) -> Graph:
+        return self.get(key)
+
+    def __setitem__(self, key: Hashable, graph: Graph) -> None:
+        self.put(key, graph)
+
+    def __delitem__(self, key: Hashable) -> None:
+        if key not in self._entries:
+            raise KeyError(key)
+        self.remove(key)
+
+    def __enter__(self) -> 'GraphStore':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _touch(self, key: Hashable) -> _StoreEntry:
+        """Mark key as most recently used and make sure its graph is loaded"""
+        entry = self._entries[key]
+        if entry.graph is None:
+            graph = read_graph_from_file(entry.spill_path)
+            graph.input_type = entry.input_type
+            entry.graph = graph
+            entry.size = estimate_graph_size(graph)
+            self.memory_usage += entry.size
+            self._resident[key] = None
+            self.reloads += 1
+            self._enforce_budget()
+        else:
+            self._resident.move_to_end(key)
+        return entry
+
+    def _enforce_budget(self) -> None:
+        """Spill least recently used graphs until the budget is met.
+        The most recently used graph always stays in memory"""
+        while self.memory_usage > self.memory_budget and len(self._resident) > 1:
+            key, _ = self._resident.popitem(last=False)
+            self._spill(self._entries[key])
+
+    def _spill(self, entry: _StoreEntry) -> None:
+        """Write a graph to its spill file, unless that file is still up to
+        date, and drop it from memory"""
+        if entry.spill_path is None:
+            # A unique name, so stores sharing spill_dir never touch each other's files
+            fd, entry.spill_path = tempfile.mkstemp(dir=self.spill_dir, suffix=".graph")
+            os.close(fd)
+        if not entry.spill_current:
+            write_graph_to_file(entry.graph, entry.spill_path, self.spill_format)
+            entry.spill_current = True
+        self.memory_usage -= entry.size
+        entry.graph = None
+        entry.analyses.clear()
+        entry.analyses_size = 0
+        entry.size = 0
+        self.evictions += 1
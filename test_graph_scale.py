@@ -0,0 +1,227 @@
+import os
+import random
+import tempfile
+import time
+import unittest
+from graph import Graph, GraphInputType, Vertex
+from graph_generators import (
+    create_complete_graph,
+    create_cycle_graph,
+    create_wheel_graph,
+    create_hypercube_graph,
+)
+from graph_io import read_graph_from_file, write_graph_to_file
+import graph_analysis
+
+# Tiers to run, e.g. GRAPH_TEST_TIERS=small,medium,large. The large tier
+# builds graphs with about a million edges and takes several minutes.
+TIERS = os.environ.get("GRAPH_TEST_TIERS", "small,medium").split(",")
+SEED = int(os.environ.get("GRAPH_TEST_SEED", "2024"))
+
+# Approximate number of edges per tier
+TIER_EDGES = {"small": 200, "medium": 20_000, "large": 1_000_000}
+
+# Seconds allowed for a single analysis, read or write: about 3-5x the slowest
+# such operation measured per tier (5 ms, 0.6 s and 8 s), a little more for
+# small where timer and GC noise dominate
+TIME_BUDGETS = {"small": 0.03, "medium": 2.5, "large": 30}
+
+# The Matrix format is quadratic in the number of vertices and the bitset
+# backend keeps one integer as wide as the graph per vertex
+MAX_MATRIX_VERTICES = 2_000
+MAX_BITSET_VERTICES = 50_000
+
+REFERENCE_BACKEND = "sets"
+
+def _relabel(graph: Graph) -> Graph:
+    """Copy graph with labels v0, v1, ... in vertex order, so that every
+    label survives the whitespace-separated text formats"""
+    names = {v: f"v{i}" for i, v in enumerate(graph.vertices)}
+    relabeled = Graph()
+    relabeled.input_type = graph.input_type
+    for v, vertex in graph.vertices.items():
+        relabeled.vertices[names[v]] = Vertex(names[v], {names[n] for n in vertex.neighbors})
+    return relabeled
+
+def _graph_from_edges(num_vertices: int, edges) -> Graph:
+    """Build an undirected graph on vertices v0 .. v{num_vertices - 1}"""
+    graph = Graph()
+    labels = [f"v{i}" for i in range(num_vertices)]
+    for v in labels:
+        graph.vertices[v] = Vertex(v)
+    for i, j in edges:
+        graph.vertices[labels[i]].neighbors.add(labels[j])
+        graph.vertices[labels[j]].neighbors.add(labels[i])
+    return graph
+
+def _hypercube(dimension: int) -> Graph:
+    """Qn built by flipping bits, for sizes where the generator is too slow"""
+    return _graph_from_edges(1 << dimension, ((i, i ^ (1 << b))
+                                             for i in range(1 << dimension)
+                                             for b in range(dimension)
+                                             if i < i ^ (1 << b)))
+
+def _random_gnm(rng: random.Random, num_vertices: int, num_edges: int) -> Graph:
+    """Uniform random graph with num_edges distinct edges"""
+    edges = set()
+    while len(edges) < num_edges:
+        i, j = rng.randrange(num_vertices), rng.randrange(num_vertices)
+        if i != j:
+            edges.add((min(i, j), max(i, j)))
+    return _graph_from_edges(num_vertices, edges)
+
+def _random_bipartite(rng: random.Random, num_vertices: int, num_edges: int) -> Graph:
+    """Random graph whose edges all join the first and second half of the vertices"""
+    half = num_vertices // 2
+    edges = set()
+    while len(edges) < num_edges:
+        edges.add((rng.randrange(half), rng.randrange(half, num_vertices)))
+    return _graph_from_edges(num_vertices, edges)
+
+def _random_cycles(rng: random.Random, num_vertices: int) -> Graph:
+    """Disjoint cycles of random lengths over shuffled vertices"""
+    order = list(range(num_vertices))
+    rng.shuffle(order)
+    edges = []
+    start = 0
+    while start < num_vertices:
+        length = rng.randint(3, 50)
+        if num_vertices - start - length < 3:
+            length = num_vertices - start
+        cycle = order[start:start + length]
+        edges.extend(zip(cycle, cycle[1:] + cycle[:1]))
+        start += length
+    return _graph_from_edges(num_vertices, edges)
+
+def build_graphs(tier: str, rng: random.Random):
+    """Yield (name, graph) for every family and random model at a tier"""
+    edges = TIER_EDGES[tier]
+
+    n = 2
+    while n * (n + 1) // 2 <= edges:
+        n += 1
+    yield f"K{n}", _relabel(create_complete_graph(n))
+    yield f"C{edges}", _relabel(create_cycle_graph(edges))
+    yield f"W{edges // 2}", _relabel(create_wheel_graph(edges // 2))
+
+    dimension = 1
+    while (dimension + 1) << dimension <= edges:
+        dimension += 1
+    if dimension <= 7:
+        yield f"Q{dimension}", _relabel(create_hypercube_graph(dimension))
+    else:
+        yield f"Q{dimension}", _hypercube(dimension)
+
+    yield "gnm sparse", _random_gnm(rng, edges, edges)
+    yield "gnm dense", _random_gnm(rng, n * 2, min(edges, n * (2 * n - 1) // 2))
+    yield "random bipartite", _random_bipartite(rng, edges // 2, edges)
+    yield "random cycles", _random_cycles(rng, edges)
+
+def _backends_for(graph: Graph):
+    for name in graph_analysis.available_backends():
+        if name == "bitset" and len(graph.vertices) > MAX_BITSET_VERTICES:
+            continue
+        yield name
+
+def _is_valid_bipartition(graph: Graph, sets) -> bool:
+    set1, set2 = sets
+    if set1 & set2 or set1 | set2 != set(graph.vertices):
+        return False
+    return all((v in set1) != (n in set1)
+               for v, vertex in graph.vertices.items() for n in vertex.neighbors)
+
+class TestGraphsAtScale(unittest.TestCase):
+    def timed(self, tier: str, what: str, func, *args, **kwargs):
+        start = time.perf_counter()
+        result = func(*args, **kwargs)
+        elapsed = time.perf_counter() - start
+        self.assertLess(elapsed, TIME_BUDGETS[tier],
+                        f"{what} took {elapsed:.1f}s, over the {tier} budget")
+        return result
+
+    def check_backends_agree(self, tier: str, name: str, graph: Graph):
+        analyses = ("_find_connected_components", "is_bipartite",
+                    "is_complete_bipartite", "determine_graph_type")
+        for analysis in analyses:
+            expected = self.timed(tier, f"{name} {analysis} ({REFERENCE_BACKEND})",
+                                  getattr(graph, analysis), backend=REFERENCE_BACKEND)
+            for backend in _backends_for(graph):
+                with self.subTest(tier=tier, graph=name, analysis=analysis, backend=backend):
+                    result = self.timed(tier, f"{name} {analysis} ({backend})",
+                                        getattr(graph, analysis), backend=backend)
+                    self.assertEqual(result, expected)
+
+    def check_round_trips(self, tier: str, name: str, graph: Graph, tmpdir: str):
+        expected_components = {frozenset(c) for c in graph._find_connected_components()}
+        expected_bipartite, _ = graph.is_bipartite()
+        expected_type = graph.determine_graph_type()
+
+        for output_type in GraphInputType:
+            if output_type == GraphInputType.MATRIX and len(graph.vertices) > MAX_MATRIX_VERTICES:
+                continue
+            for suffix in ("", ".gz"):
+                with self.subTest(tier=tier, graph=name, format=output_type.value, suffix=suffix):
+                    path = os.path.join(tmpdir, f"graph.{output_type.value}{suffix}")
+                    self.timed(tier, f"{name} write {output_type.value}{suffix}",
+                               write_graph_to_file, graph, path, output_type)
+                    loaded = self.timed(tier, f"{name} read {output_type.value}{suffix}",
+                                        read_graph_from_file, path)
+
+                    self.assertEqual(loaded.to_adjacency_list(), graph.to_adjacency_list())
+                    self.assertEqual({frozenset(c) for c in loaded._find_connected_components()},
+                                     expected_components)
+                    is_bip, sets = loaded.is_bipartite()
+                    self.assertEqual(is_bip, expected_bipartite)
+                    if is_bip:
+                        self.assertTrue(_is_valid_bipartition(loaded, sets))
+                    self.assertEqual(loaded.determine_graph_type(), expected_type)
+
+    def check_family_properties(self, name: str, graph: Graph):
+        is_complete, is_cycle, is_wheel, is_hypercube = graph.determine_graph_type()
+        if name.startswith("K"):
+            self.assertTrue(is_complete)
+        elif name.startswith("C"):
+            self.assertTrue(is_cycle)
+        elif name.startswith("W"):
+            self.assertTrue(is_wheel)
+        elif name.startswith("Q"):
+            self.assertTrue(is_hypercube)
+            self.assertTrue(graph.is_bipartite()[0])
+        elif name == "random bipartite":
+            self.assertTrue(graph.is_bipartite()[0])
+        elif name == "random cycles":
+            self.assertTrue(all(len(v.neighbors) == 2 for v in graph.vertices.values()))
+
+    def test_tiers(self):
+        for tier in TIERS:
+            rng = random.Random(f"{SEED}-{tier}")
+            for name, graph in build_graphs(tier, rng):
+                with self.subTest(tier=tier, graph=name, seed=SEED):
+                    self.check_family_properties(name, graph)
+                self.check_backends_agree(tier, name, graph)
+                with tempfile.TemporaryDirectory() as tmpdir:
+                    self.check_round_trips(tier, name, graph, tmpdir)
+
+    def test_cached_csr_not_slower_than_sets(self):
+        """Guards the point of the csr backend: once its view is built, an
+        analysis must not be slower than on the neighbor sets"""
+        edges = TIER_EDGES["medium"]
+        graph = _random_gnm(random.Random(f"{SEED}-relative"), edges, edges)
+
+        def best_time(func, repeats=3):
+            times = []
+            for _ in range(repeats):
+                start = time.perf_counter()
+                func()
+                times.append(time.perf_counter() - start)
+            return min(times)
+
+        sets_time = best_time(lambda: graph._find_connected_components(backend="sets"))
+        with graph_analysis.cached_views(graph):
+            graph._find_connected_components(backend="csr")  # builds the view
+            csr_time = best_time(lambda: graph._find_connected_components(backend="csr"))
+        self.assertLessEqual(csr_time, sets_time,
+                             f"cached csr took {csr_time:.3f}s, sets {sets_time:.3f}s")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -7,6 +7,17 @@ from graph_generators import (
     create_hypercube_graph,
     create_random_graph
 )
+from graph_io import read_graph_from_file, write_graph_to_file, iter_graphs_from_files
+from graph_store import GraphStore, estimate_graph_size
+import graph_analysis
+import importlib.util
+import os
+import random
+import tempfile
+import threading
+import time
+import tracemalloc
+from unittest import mock
 
 class TestGraphCreation(unittest.TestCase):
     def test_complete_graph(self):
@@ -88,6 +99,344 @@ class TestGraphProperties(unittest.TestCase):
             for v2 in self.g.vertices[v1].neighbors:
                 self.assertIn(v2, set2)
 
+class TestAnalysisBackends(unittest.TestCase):
+    def setUp(self):
+        self.graphs = [
+            create_complete_graph(4),
+            create_cycle_graph(5),
+            create_cycle_graph(6),
+            create_wheel_graph(6),
+            create_hypercube_graph(3),
+            create_random_graph(8, 6),
+            Graph(),
+        ]
+        # A hand-built graph whose neighbor 'b' is missing from the vertex table
+        dangling = Graph()
+        dangling.vertices['a'] = Vertex('a', {'b'})
+        dangling.vertices['c'] = Vertex('c', {'a'})
+        self.graphs.append(dangling)
+    
+    def test_backends_agree(self):
+        for g in self.graphs:
+            expected_components = sorted(map(sorted, g._find_connected_components()))
+            for name in graph_analysis.available_backends():
+                components = g._find_connected_components(backend=name)
+                self.assertEqual(sorted(map(sorted, components)), expected_components)
+                self.assertEqual(g.is_bipartite(backend=name), g.is_bipartite())
+                self.assertEqual(g.is_complete_bipartite(backend=name), g.is_complete_bipartite())
+                self.assertEqual(g.determine_graph_type(backend=name), g.determine_graph_type())
+    
+    def test_default_backend(self):
+        previous = graph_analysis.get_default_backend()
+        try:
+            graph_analysis.set_default_backend("bitset")
+            self.assertEqual(graph_analysis.get_default_backend(), "bitset")
+            self.assertTrue(create_cycle_graph(5).determine_graph_type()[1])
+        finally:
+            graph_analysis.set_default_backend(previous)
+    
+    def test_views_rebuilt_on_every_call(self):
+        g = create_cycle_graph(6)
+        self.assertTrue(g.is_connected(backend="csr")[0])
+        # Moving two edges splits the cycle without changing any counts
+        for v1, v2 in (('a', 'b'), ('d', 'e')):
+            g.vertices[v1].neighbors.discard(v2)
+            g.vertices[v2].neighbors.discard(v1)
+        for v1, v2 in (('a', 'e'), ('b', 'd')):
+            g.vertices[v1].neighbors.add(v2)
+            g.vertices[v2].neighbors.add(v1)
+        for name in graph_analysis.available_backends():
+            self.assertEqual(g.is_connected(backend=name), g.is_connected(backend="sets"))
+    
+    def test_cached_views(self):
+        g = create_cycle_graph(6)
+        with graph_analysis.cached_views(g):
+            self.assertTrue(g.is_connected(backend="csr")[0])
+            view = g._analysis_cache["csr"]
+            g.is_bipartite(backend="csr")
+            self.assertIs(g._analysis_cache["csr"], view)
+            self.assertEqual(g.is_bipartite(backend="bitset"), g.is_bipartite(backend="sets"))
+        self.assertIsNone(g._analysis_cache)
+    
+    def test_unknown_backend(self):
+        with self.assertRaises(ValueError):
+            graph_analysis.set_default_backend("gpu")
+        with self.assertRaises(ValueError):
+            create_cycle_graph(5).is_bipartite(backend="gpu")
+
+def _zstd_available() -> bool:
+    for module in ("compression.zstd", "zstandard"):
+        try:
+            if importlib.util.find_spec(module) is not None:
+                return True
+        except ImportError:
+            pass
+    return False
+
+class TestGraphIO(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+    
+    def tearDown(self):
+        self.tmpdir.cleanup()
+    
+    def assertSameGraph(self, g1, g2):
+        self.assertEqual(g1.to_adjacency_list(), g2.to_adjacency_list())
+    
+    def test_round_trip_all_formats(self):
+        g = create_hypercube_graph(4)
+        for output_type in GraphInputType:
+            for name in ("graph.txt", "graph.txt.gz"):
+                path = os.path.join(self.tmpdir.name, name)
+                write_graph_to_file(g, path, output_type)
+                h = read_graph_from_file(path)
+                self.assertEqual(h.input_type, output_type)
+                self.assertSameGraph(g, h)
+    
+    def test_compression_detected_from_magic_bytes(self):
+        g = create_wheel_graph(6)
+        path = os.path.join(self.tmpdir.name, "graph.dat")
+        write_graph_to_file(g, path, GraphInputType.LIST, compression="gzip")
+        with open(path, "rb") as f:
+            self.assertEqual(f.read(2), b"\x1f\x8b")
+        self.assertSameGraph(g, read_graph_from_file(path))
+    
+    def test_compresslevel(self):
+        g = create_hypercube_graph(6)
+        sizes = {}
+        for level in (1, 9):
+            path = os.path.join(self.tmpdir.name, f"graph{level}.txt.gz")
+            write_graph_to_file(g, path, GraphInputType.MATRIX, compresslevel=level)
+            self.assertSameGraph(g, read_graph_from_file(path))
+            sizes[level] = os.path.getsize(path)
+        self.assertLessEqual(sizes[9], sizes[1])
+    
+    def test_compact_large_gaps(self):
+        g = create_cycle_graph(3)
+        for i in range(300):
+            g.vertices[f"z{i}"] = Vertex(f"z{i}")
+        g.vertices["a"].neighbors.add("z299")
+        path = os.path.join(self.tmpdir.name, "graph.cg")
+        write_graph_to_file(g, path, GraphInputType.COMPACT)
+        self.assertSameGraph(g, read_graph_from_file(path))
+    
+    @unittest.skipUnless(_zstd_available(), "needs compression.zstd or zstandard")
+    def test_zstd_round_trip(self):
+        g = create_hypercube_graph(4)
+        for output_type in GraphInputType:
+            path = os.path.join(self.tmpdir.name, "graph.txt.zst")
+            write_graph_to_file(g, path, output_type)
+            with open(path, "rb") as f:
+                self.assertEqual(f.read(4), b"\x28\xb5\x2f\xfd")
+            self.assertSameGraph(g, read_graph_from_file(path))
+        # Detected from the magic bytes, whatever the file is called
+        path = os.path.join(self.tmpdir.name, "graph.dat")
+        write_graph_to_file(g, path, GraphInputType.LIST, compression="zstd")
+        self.assertSameGraph(g, read_graph_from_file(path))
+    
+    def test_corrupt_compact_file(self):
+        path = os.path.join(self.tmpdir.name, "graph.cg")
+        write_graph_to_file(create_wheel_graph(6), path, GraphInputType.COMPACT)
+        with open(path, "rb") as f:
+            data = f.read()
+        for cut in (len(data) - 1, len(data) // 2, len("Compact\n") + 2):
+            with open(path, "wb") as f:
+                f.write(data[:cut])
+            with self.assertRaises(ValueError):
+                read_graph_from_file(path)
+        # A neighbor id pointing past the last vertex
+        with open(path, "wb") as f:
+            f.write(b"Compact\n\x01\x01a\x01\x05")
+        with self.assertRaises(ValueError):
+            read_graph_from_file(path)
+    
+    def test_labels_are_utf8(self):
+        g = Graph()
+        for label in ("\u00e7i\u011fde", "\u015fehir"):
+            g.vertices[label] = Vertex(label)
+        g.vertices["\u00e7i\u011fde"].neighbors.add("\u015fehir")
+        g.vertices["\u015fehir"].neighbors.add("\u00e7i\u011fde")
+        for output_type in GraphInputType:
+            path = os.path.join(self.tmpdir.name, f"graph.{output_type.value}")
+            write_graph_to_file(g, path, output_type)
+            with open(path, "rb") as f:
+                self.assertIn("\u015fehir".encode("utf-8"), f.read())
+            self.assertSameGraph(g, read_graph_from_file(path))
+    
+    def test_compact_is_smaller(self):
+        g = create_cycle_graph(20)
+        sizes = {}
+        for output_type in GraphInputType:
+            path = os.path.join(self.tmpdir.name, output_type.value)
+            write_graph_to_file(g, path, output_type)
+            sizes[output_type] = os.path.getsize(path)
+        self.assertLess(sizes[GraphInputType.COMPACT], sizes[GraphInputType.LIST])
+        self.assertLess(sizes[GraphInputType.LIST], sizes[GraphInputType.MATRIX])
+    
+    def test_iter_graphs_from_files(self):
+        graphs = [create_cycle_graph(n) for n in range(3, 10)]
+        paths = []
+        for i, g in enumerate(graphs):
+            path = os.path.join(self.tmpdir.name, f"graph{i}.txt.gz")
+            write_graph_to_file(g, path, GraphInputType.LIST)
+            paths.append(path)
+        loaded = list(iter_graphs_from_files(paths, prefetch=2))
+        self.assertEqual([path for path, _ in loaded], paths)
+        for g, (_, h) in zip(graphs, loaded):
+            self.assertSameGraph(g, h)
+    
+    def test_iter_graphs_from_files_raises_read_errors(self):
+        missing = os.path.join(self.tmpdir.name, "missing.txt")
+        with self.assertRaises(FileNotFoundError):
+            list(iter_graphs_from_files([missing]))
+    
+    def _slow_reads(self):
+        """Patch read_graph_from_file with a slow fake that records which
+        files have started loading"""
+        started = []
+        lock = threading.Lock()
+        
+        def slow_read(filename):
+            with lock:
+                started.append(filename)
+            time.sleep(0.02)
+            return create_cycle_graph(3)
+        
+        return started, mock.patch("graph_io.read_graph_from_file", slow_read)
+    
+    def test_iter_graphs_from_files_prefetch_bound(self):
+        started, patch = self._slow_reads()
+        paths = [f"graph{i}" for i in range(12)]
+        prefetch = 3
+        with patch:
+            for consumed, (path, _) in enumerate(iter_graphs_from_files(paths, prefetch=prefetch), 1):
+                time.sleep(0.05)  # give the workers time to run ahead if they could
+                self.assertEqual(path, paths[consumed - 1])
+                self.assertLessEqual(len(started), consumed + prefetch)
+        self.assertEqual(started, paths)
+    
+    def test_iter_graphs_from_files_close_early(self):
+        started, patch = self._slow_reads()
+        paths = [f"graph{i}" for i in range(20)]
+        with patch:
+            graphs = iter_graphs_from_files(paths, prefetch=3)
+            next(graphs)
+            graphs.close()  # cancels pending reads and waits for running ones
+            count = len(started)
+            time.sleep(0.1)
+        self.assertEqual(len(started), count)
+        self.assertLessEqual(count, 4)
+    
+    def test_unknown_compression(self):
+        path = os.path.join(self.tmpdir.name, "graph.txt")
+        with self.assertRaises(ValueError):
+            write_graph_to_file(create_cycle_graph(5), path, GraphInputType.LIST, compression="lz4")
+
+class TestGraphStore(unittest.TestCase):
+    def setUp(self):
+        self.graphs = {n: create_cycle_graph(n) for n in range(10, 16)}
+        budget = 2 * max(estimate_graph_size(g) for g in self.graphs.values())
+        self.store = GraphStore(budget)
+        for n, g in self.graphs.items():
+            self.store.put(n, g)
+    
+    def tearDown(self):
+        self.store.close()
+    
+    def test_budget_enforced(self):
+        self.assertLessEqual(self.store.memory_usage, self.store.memory_budget)
+        self.assertGreater(self.store.evictions, 0)
+        self.assertFalse(self.store.is_resident(10))
+        self.assertTrue(self.store.is_resident(15))
+    
+    def test_spilled_graph_reloaded(self):
+        g = self.store.get(10)
+        self.assertEqual(self.store.reloads, 1)
+        self.assertTrue(self.store.is_resident(10))
+        self.assertEqual(g.to_adjacency_list(), self.graphs[10].to_adjacency_list())
+        self.assertEqual(g.input_type, self.graphs[10].input_type)
+        self.assertLessEqual(self.store.memory_usage, self.store.memory_budget)
+    
+    def test_analysis_cached(self):
+        usage = self.store.memory_usage
+        self.assertTrue(self.store.analyze(15, "is_connected")[0])
+        self.assertGreater(self.store.memory_usage, usage)
+        self.assertIs(self.store.analyze(15, "is_bipartite"), self.store.analyze(15, "is_bipartite"))
+    
+    def _evict(self, key):
+        for n in self.graphs:
+            if n != key:
+                self.store.analyze(n, "is_connected")
+        self.assertFalse(self.store.is_resident(key))
+    
+    def test_analyzed_graph_not_rewritten(self):
+        self.store.analyze(10, "is_connected")  # reloads 10 without handing it out
+        path = self.store._entries[10].spill_path
+        mtime = os.stat(path).st_mtime_ns
+        os.utime(path, ns=(mtime - 10**9, mtime - 10**9))
+        self._evict(10)
+        self.assertEqual(os.stat(path).st_mtime_ns, mtime - 10**9)
+        # get hands the graph out, so it is written again
+        self.store.get(10)
+        self._evict(10)
+        self.assertNotEqual(os.stat(path).st_mtime_ns, mtime - 10**9)
+    
+    def test_edits_after_get_survive_eviction(self):
+        self.assertTrue(self.store.analyze(10, "is_connected")[0])
+        g = self.store.get(10)
+        g.vertices["zz"] = Vertex("zz")
+        self.assertFalse(self.store.analyze(10, "is_connected")[0])
+        self._evict(10)
+        self.assertIn("zz", self.store.get(10).vertices)
+        self.assertFalse(self.store.analyze(10, "is_connected")[0])
+    
+    def test_stores_sharing_spill_dir(self):
+        with tempfile.TemporaryDirectory() as spill_dir:
+            budget = self.store.memory_budget
+            with GraphStore(budget, spill_dir) as store1, GraphStore(budget, spill_dir) as store2:
+                for n in self.graphs:
+                    store1.put(n, self.graphs[n])
+                    store2.put(n, create_complete_graph(n - 6))
+                for n in self.graphs:
+                    self.assertEqual(store1.get(n).to_adjacency_list(), self.graphs[n].to_adjacency_list())
+                    self.assertEqual(len(store2.get(n).vertices), n - 6)
+                store2.close()
+                for n in self.graphs:
+                    self.assertEqual(store1.get(n).to_adjacency_list(), self.graphs[n].to_adjacency_list())
+                self.assertGreater(store1.evictions, 0)
+                self.assertGreater(store1.reloads, 0)
+    
+    def test_estimate_matches_tracemalloc(self):
+        rng = random.Random(3)
+        g = Graph()
+        labels = [f"v{i}" for i in range(2000)]
+        for v in labels:
+            g.vertices[v] = Vertex(v)
+        for _ in range(10000):
+            v1, v2 = rng.sample(labels, 2)
+            g.vertices[v1].neighbors.add(v2)
+            g.vertices[v2].neighbors.add(v1)
+        path = os.path.join(self.store.spill_dir, "estimate.txt")
+        write_graph_to_file(g, path, GraphInputType.LIST)
+        del g
+        
+        tracemalloc.start()
+        try:
+            loaded = read_graph_from_file(path)
+            traced, _ = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        estimate = estimate_graph_size(loaded)
+        # Object layouts change between CPython versions, so only catch gross errors
+        self.assertTrue(traced / 2 < estimate < traced * 2, f"estimate {estimate}, traced {traced}")
+    
+    def test_remove(self):
+        del self.store[10]
+        self.assertNotIn(10, self.store)
+        self.assertEqual(len(self.store), 5)
+        with self.assertRaises(KeyError):
+            self.store.get(10)
+
 def create_test_files():
     """Create test input files"""
     # Matrix format